@@ -1,11 +1,11 @@
-from typing import Any, Callable, cast, Dict, List, Sequence, Optional, Tuple
+from typing import Any, cast, Dict, List, Sequence, Optional, Tuple
 import fastapi
 import orjson
 from anyio import (
     to_thread,
     CapacityLimiter,
 )
-from fastapi import FastAPI as _FastAPI, Response, Request
+from fastapi import FastAPI as _FastAPI, Request
 from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.routing import APIRoute
@@ -41,6 +41,7 @@ from chromadb.server.fastapi.types import (
     UpdateEmbedding,
 )
 from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import logging
 from chromadb.telemetry.product.events import ServerStartEvent
 from chromadb.utils.fastapi import fastapi_json_response, string_to_uuid as _uuid
@@ -68,52 +69,95 @@ def use_route_names_as_operation_ids(app: _FastAPI) -> None:
             route.operation_id = route.name
 
 
-async def catch_exceptions_middleware(
-    request: Request, call_next: Callable[[Request], Any]
-) -> Response:
-    try:
-        return await call_next(request)
-    except ChromaError as e:
-        return fastapi_json_response(e)
-    except Exception as e:
-        logger.exception(e)
-        return JSONResponse(content={"error": repr(e)}, status_code=500)
+async def read_body(request: Request) -> bytearray:
+    """
+    Read the request body into a single growable buffer. request.body()
+    collects every chunk and then joins them into a new bytes object, which
+    briefly holds two copies of large (e.g. embedding) payloads.
+    """
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+    return body
 
 
-async def check_http_version_middleware(
-    request: Request, call_next: Callable[[Request], Any]
-) -> Response:
-    http_version = request.scope.get("http_version")
-    if http_version not in ["1.1", "2"]:
-        raise InvalidHTTPVersion(f"HTTP version {http_version} is not supported")
-    return await call_next(request)
+class CatchExceptionsMiddleware:
+    # A pure ASGI middleware (rather than one registered via
+    # app.middleware("http")) so that we don't pay for BaseHTTPMiddleware's
+    # per-request task group and Request/Response wrappers.
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-class ChromaAPIRouter(fastapi.APIRouter):  # type: ignore
-    # A simple subclass of fastapi's APIRouter which treats URLs with a
-    # trailing "/" the same as URLs without. Docs will only contain URLs
-    # without trailing "/"s.
-    def add_api_route(self, path: str, *args: Any, **kwargs: Any) -> None:
-        # If kwargs["include_in_schema"] isn't passed OR is True, we should
-        # only include the non-"/" path. If kwargs["include_in_schema"] is
-        # False, include neither.
-        exclude_from_schema = (
-            "include_in_schema" in kwargs and not kwargs["include_in_schema"]
-        )
+        response_started = False
 
-        def include_in_schema(path: str) -> bool:
-            nonlocal exclude_from_schema
-            return not exclude_from_schema and not path.endswith("/")
+        async def _send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
 
-        kwargs["include_in_schema"] = include_in_schema(path)
-        super().add_api_route(path, *args, **kwargs)
+        try:
+            await self.app(scope, receive, _send)
+        except ChromaError as e:
+            if response_started:
+                raise
+            await fastapi_json_response(e)(scope, receive, send)
+        except Exception as e:
+            if response_started:
+                raise
+            logger.exception(e)
+            await JSONResponse(content={"error": repr(e)}, status_code=500)(
+                scope, receive, send
+            )
 
-        if path.endswith("/"):
-            path = path[:-1]
-        else:
-            path = path + "/"
 
-        kwargs["include_in_schema"] = include_in_schema(path)
+class CheckHttpVersionMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            http_version = scope.get("http_version")
+            if http_version not in ("1.1", "2"):
+                # Respond directly rather than raising, so the rejection does
+                # not depend on where CatchExceptionsMiddleware is registered.
+                error = InvalidHTTPVersion(
+                    f"HTTP version {http_version} is not supported"
+                )
+                await fastapi_json_response(error)(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+class StripTrailingSlashMiddleware:
+    # Treats URLs with a trailing "/" the same as URLs without by rewriting
+    # the path before routing, so each route only needs to be registered once.
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            path = scope["path"]
+            if len(path) > 1 and path.endswith("/"):
+                scope = dict(scope, path=path[:-1])
+                raw_path = scope.get("raw_path")
+                if raw_path and raw_path.endswith(b"/"):
+                    scope["raw_path"] = raw_path[:-1]
+        await self.app(scope, receive, send)
+
+
+class ChromaAPIRouter(fastapi.APIRouter):  # type: ignore
+    # A simple subclass of fastapi's APIRouter which only registers URLs
+    # without a trailing "/". Requests for URLs with a trailing "/" are
+    # rewritten by StripTrailingSlashMiddleware before they reach the router.
+    def add_api_route(self, path: str, *args: Any, **kwargs: Any) -> None:
+        if len(path) > 1 and path.endswith("/"):
+            path = path[:-1]
         super().add_api_route(path, *args, **kwargs)
 
 
@@ -131,8 +175,9 @@ class FastAPI(Server):
         )
         self._system.start()
 
-        self._app.middleware("http")(check_http_version_middleware)
-        self._app.middleware("http")(catch_exceptions_middleware)
+        self._app.add_middleware(StripTrailingSlashMiddleware)
+        self._app.add_middleware(CheckHttpVersionMiddleware)
+        self._app.add_middleware(CatchExceptionsMiddleware)
         self._app.add_middleware(
             CORSMiddleware,
             allow_headers=["*"],
@@ -370,7 +415,7 @@ class FastAPI(Server):
         self, request: Request, tenant: str = DEFAULT_TENANT
     ) -> None:
         def process_create_database(
-            tenant: str, headers: Headers, raw_body: bytes
+            tenant: str, headers: Headers, raw_body: bytearray
         ) -> None:
             db = CreateDatabase.model_validate(orjson.loads(raw_body))
 
@@ -395,7 +440,7 @@ class FastAPI(Server):
             process_create_database,
             tenant,
             request.headers,
-            await request.body(),
+            await read_body(request),
             limiter=self._capacity_limiter,
         )
 
@@ -433,7 +478,7 @@ class FastAPI(Server):
 
     @trace_method("FastAPI.create_tenant", OpenTelemetryGranularity.OPERATION)
     async def create_tenant(self, request: Request) -> None:
-        def process_create_tenant(request: Request, raw_body: bytes) -> None:
+        def process_create_tenant(request: Request, raw_body: bytearray) -> None:
             tenant = CreateTenant.model_validate(orjson.loads(raw_body))
 
             maybe_tenant, _ = self.auth_and_get_tenant_and_database_for_request(
@@ -451,7 +496,7 @@ class FastAPI(Server):
         await to_thread.run_sync(
             process_create_tenant,
             request,
-            await request.body(),
+            await read_body(request),
             limiter=self._capacity_limiter,
         )
 
@@ -488,7 +533,7 @@ class FastAPI(Server):
         offset: Optional[int] = None,
         tenant: str = DEFAULT_TENANT,
         database: str = DEFAULT_DATABASE,
-    ) -> Sequence[CollectionModel]:
+    ) -> ORJSONResponse:
         (
             maybe_tenant,
             maybe_database,
@@ -516,7 +561,7 @@ class FastAPI(Server):
             ),
         )
 
-        return [c.get_model() for c in api_collections]
+        return ORJSONResponse([c.get_model() for c in api_collections])
 
     @trace_method("FastAPI.count_collections", OpenTelemetryGranularity.OPERATION)
     async def count_collections(
@@ -558,7 +603,7 @@ class FastAPI(Server):
         database: str = DEFAULT_DATABASE,
     ) -> CollectionModel:
         def process_create_collection(
-            request: Request, tenant: str, database: str, raw_body: bytes
+            request: Request, tenant: str, database: str, raw_body: bytearray
         ) -> Collection:
             create = CreateCollection.model_validate(orjson.loads(raw_body))
 
@@ -592,7 +637,7 @@ class FastAPI(Server):
                 request,
                 tenant,
                 database,
-                await request.body(),
+                await read_body(request),
                 limiter=self._capacity_limiter,
             ),
         )
@@ -642,28 +687,26 @@ class FastAPI(Server):
         collection_id: str,
         request: Request,
     ) -> None:
-        def process_update_collection(
-            request: Request, collection_id: str, raw_body: bytes
-        ) -> None:
+        def process_update_collection(collection_id: str, raw_body: bytearray) -> None:
             update = UpdateCollection.model_validate(orjson.loads(raw_body))
-            self.auth_and_get_tenant_and_database_for_request(
-                request.headers,
-                AuthzAction.UPDATE_COLLECTION,
-                None,
-                None,
-                collection_id,
-            )
             return self._api._modify(
                 id=_uuid(collection_id),
                 new_name=update.new_name,
                 new_metadata=update.new_metadata,
             )
 
+        self.auth_and_get_tenant_and_database_for_request(
+            request.headers,
+            AuthzAction.UPDATE_COLLECTION,
+            None,
+            None,
+            collection_id,
+        )
+
         await to_thread.run_sync(
             process_update_collection,
-            request,
             collection_id,
-            await request.body(),
+            await read_body(request),
             limiter=self._capacity_limiter,
         )
 
@@ -702,15 +745,8 @@ class FastAPI(Server):
     async def add(self, request: Request, collection_id: str) -> bool:
         try:
 
-            def process_add(request: Request, raw_body: bytes) -> bool:
+            def process_add(raw_body: bytearray) -> bool:
                 add = AddEmbedding.model_validate(orjson.loads(raw_body))
-                self.auth_and_get_tenant_and_database_for_request(
-                    request.headers,
-                    AuthzAction.ADD,
-                    None,
-                    None,
-                    collection_id,
-                )
                 return self._api._add(
                     collection_id=_uuid(collection_id),
                     ids=add.ids,
@@ -720,12 +756,19 @@ class FastAPI(Server):
                     uris=add.uris,  # type: ignore
                 )
 
+            self.auth_and_get_tenant_and_database_for_request(
+                request.headers,
+                AuthzAction.ADD,
+                None,
+                None,
+                collection_id,
+            )
+
             return cast(
                 bool,
                 await to_thread.run_sync(
                     process_add,
-                    request,
-                    await request.body(),
+                    await read_body(request),
                     limiter=self._capacity_limiter,
                 ),
             )
@@ -734,17 +777,9 @@ class FastAPI(Server):
 
     @trace_method("FastAPI.update", OpenTelemetryGranularity.OPERATION)
     async def update(self, request: Request, collection_id: str) -> None:
-        def process_update(request: Request, raw_body: bytes) -> bool:
+        def process_update(raw_body: bytearray) -> bool:
             update = UpdateEmbedding.model_validate(orjson.loads(raw_body))
 
-            self.auth_and_get_tenant_and_database_for_request(
-                request.headers,
-                AuthzAction.UPDATE,
-                None,
-                None,
-                collection_id,
-            )
-
             return self._api._update(
                 collection_id=_uuid(collection_id),
                 ids=update.ids,
@@ -754,26 +789,25 @@ class FastAPI(Server):
                 uris=update.uris,  # type: ignore
             )
 
+        self.auth_and_get_tenant_and_database_for_request(
+            request.headers,
+            AuthzAction.UPDATE,
+            None,
+            None,
+            collection_id,
+        )
+
         await to_thread.run_sync(
             process_update,
-            request,
-            await request.body(),
+            await read_body(request),
             limiter=self._capacity_limiter,
         )
 
     @trace_method("FastAPI.upsert", OpenTelemetryGranularity.OPERATION)
     async def upsert(self, request: Request, collection_id: str) -> None:
-        def process_upsert(request: Request, raw_body: bytes) -> bool:
+        def process_upsert(raw_body: bytearray) -> bool:
             upsert = AddEmbedding.model_validate(orjson.loads(raw_body))
 
-            self.auth_and_get_tenant_and_database_for_request(
-                request.headers,
-                AuthzAction.UPSERT,
-                None,
-                None,
-                collection_id,
-            )
-
             return self._api._upsert(
                 collection_id=_uuid(collection_id),
                 ids=upsert.ids,
@@ -783,24 +817,24 @@ class FastAPI(Server):
                 uris=upsert.uris,  # type: ignore
             )
 
+        self.auth_and_get_tenant_and_database_for_request(
+            request.headers,
+            AuthzAction.UPSERT,
+            None,
+            None,
+            collection_id,
+        )
+
         await to_thread.run_sync(
             process_upsert,
-            request,
-            await request.body(),
+            await read_body(request),
             limiter=self._capacity_limiter,
         )
 
     @trace_method("FastAPI.get", OpenTelemetryGranularity.OPERATION)
-    async def get(self, collection_id: str, request: Request) -> GetResult:
-        def process_get(request: Request, raw_body: bytes) -> GetResult:
+    async def get(self, collection_id: str, request: Request) -> ORJSONResponse:
+        def process_get(raw_body: bytearray) -> GetResult:
             get = GetEmbedding.model_validate(orjson.loads(raw_body))
-            self.auth_and_get_tenant_and_database_for_request(
-                request.headers,
-                AuthzAction.GET,
-                None,
-                None,
-                collection_id,
-            )
             return self._api._get(
                 collection_id=_uuid(collection_id),
                 ids=get.ids,
@@ -812,27 +846,30 @@ class FastAPI(Server):
                 include=get.include,
             )
 
-        return cast(
+        self.auth_and_get_tenant_and_database_for_request(
+            request.headers,
+            AuthzAction.GET,
+            None,
+            None,
+            collection_id,
+        )
+
+        get_result = cast(
             GetResult,
             await to_thread.run_sync(
                 process_get,
-                request,
-                await request.body(),
+                await read_body(request),
                 limiter=self._capacity_limiter,
             ),
         )
+        # Returning a Response directly skips FastAPI's jsonable_encoder,
+        # which would otherwise walk every element of the result.
+        return ORJSONResponse(get_result)
 
     @trace_method("FastAPI.delete", OpenTelemetryGranularity.OPERATION)
     async def delete(self, collection_id: str, request: Request) -> List[UUID]:
-        def process_delete(request: Request, raw_body: bytes) -> List[str]:
+        def process_delete(raw_body: bytearray) -> List[str]:
             delete = DeleteEmbedding.model_validate(orjson.loads(raw_body))
-            self.auth_and_get_tenant_and_database_for_request(
-                request.headers,
-                AuthzAction.DELETE,
-                None,
-                None,
-                collection_id,
-            )
             return self._api._delete(
                 collection_id=_uuid(collection_id),
                 ids=delete.ids,
@@ -840,12 +877,19 @@ class FastAPI(Server):
                 where_document=delete.where_document,
             )
 
+        self.auth_and_get_tenant_and_database_for_request(
+            request.headers,
+            AuthzAction.DELETE,
+            None,
+            None,
+            collection_id,
+        )
+
         return cast(
             List[UUID],
             await to_thread.run_sync(
                 process_delete,
-                request,
-                await request.body(),
+                await read_body(request),
                 limiter=self._capacity_limiter,
             ),
         )
@@ -899,18 +943,10 @@ class FastAPI(Server):
         self,
         collection_id: str,
         request: Request,
-    ) -> QueryResult:
-        def process_query(request: Request, raw_body: bytes) -> QueryResult:
+    ) -> ORJSONResponse:
+        def process_query(raw_body: bytearray) -> QueryResult:
             query = QueryEmbedding.model_validate(orjson.loads(raw_body))
 
-            self.auth_and_get_tenant_and_database_for_request(
-                request.headers,
-                AuthzAction.QUERY,
-                None,
-                None,
-                collection_id,
-            )
-
             return self._api._query(
                 collection_id=_uuid(collection_id),
                 query_embeddings=query.query_embeddings,
@@ -920,16 +956,23 @@ class FastAPI(Server):
                 include=query.include,
             )
 
+        self.auth_and_get_tenant_and_database_for_request(
+            request.headers,
+            AuthzAction.QUERY,
+            None,
+            None,
+            collection_id,
+        )
+
         nnresult = cast(
             QueryResult,
             await to_thread.run_sync(
                 process_query,
-                request,
-                await request.body(),
+                await read_body(request),
                 limiter=self._capacity_limiter,
             ),
         )
-        return nnresult
+        return ORJSONResponse(nnresult)
 
     async def pre_flight_checks(self) -> Dict[str, Any]:
         def process_pre_flight_checks() -> Dict[str, Any]:
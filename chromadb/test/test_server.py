@@ -0,0 +1,133 @@
+import asyncio
+from typing import Any, Dict, Generator, List
+
+import orjson
+import pytest
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from starlette.types import Message, Receive, Scope, Send
+
+from chromadb.config import Settings
+from chromadb.server.fastapi import (
+    CatchExceptionsMiddleware,
+    CheckHttpVersionMiddleware,
+    FastAPI,
+)
+
+
+@pytest.fixture(scope="module")
+def server() -> Generator[FastAPI, None, None]:
+    server = FastAPI(
+        Settings(
+            chroma_api_impl="chromadb.api.segment.SegmentAPI",
+            is_persistent=False,
+            anonymized_telemetry=False,
+        )
+    )
+    yield server
+    server.shutdown()
+
+
+def _http_scope(http_version: str = "1.1", path: str = "/api/v1") -> Scope:
+    return {
+        "type": "http",
+        "http_version": http_version,
+        "method": "GET",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "scheme": "http",
+        "query_string": b"",
+        "headers": [],
+        "server": ("testserver", 80),
+        "client": ("testclient", 50000),
+    }
+
+
+def _call(app: Any, scope: Scope) -> List[Message]:
+    messages: List[Message] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return messages
+
+
+async def _ok_app(scope: Scope, receive: Receive, send: Send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def _failing_app(scope: Scope, receive: Receive, send: Send) -> None:
+    raise ValueError("boom")
+
+
+def _status_and_body(messages: List[Message]) -> Any:
+    start, body = messages
+    assert start["type"] == "http.response.start"
+    assert body["type"] == "http.response.body"
+    return start["status"], body["body"]
+
+
+def test_check_http_version_middleware_rejects_http_1_0() -> None:
+    app = CheckHttpVersionMiddleware(_ok_app)
+    status, body = _status_and_body(_call(app, _http_scope(http_version="1.0")))
+    assert status == 400
+    assert orjson.loads(body) == {
+        "error": "InvalidHTTPVersion",
+        "message": "HTTP version 1.0 is not supported",
+    }
+
+
+def test_check_http_version_middleware_allows_supported_versions() -> None:
+    app = CheckHttpVersionMiddleware(_ok_app)
+    for http_version in ("1.1", "2"):
+        status, body = _status_and_body(
+            _call(app, _http_scope(http_version=http_version))
+        )
+        assert status == 200
+        assert body == b"ok"
+
+
+def test_catch_exceptions_middleware_returns_500_for_unhandled_errors() -> None:
+    app = CatchExceptionsMiddleware(_failing_app)
+    status, body = _status_and_body(_call(app, _http_scope()))
+    assert status == 500
+    error: Dict[str, str] = orjson.loads(body)
+    assert error == {"error": "ValueError('boom')"}
+
+
+def test_routes_are_registered_once_without_trailing_slash(server: FastAPI) -> None:
+    routes = [
+        (route.path, method)
+        for route in server.app().routes
+        if isinstance(route, APIRoute)
+        for method in route.methods
+    ]
+    assert len(routes) == len(set(routes))
+    assert all(path == "/" or not path.endswith("/") for path, _ in routes)
+
+
+def test_trailing_slash_is_stripped_before_routing(server: FastAPI) -> None:
+    # Don't follow redirects, so this can't pass via Starlette's
+    # redirect_slashes fallback.
+    client = TestClient(server.app(), follow_redirects=False)
+
+    response = client.get("/api/v1/heartbeat/")
+    assert response.status_code == 200
+    assert "nanosecond heartbeat" in response.json()
+
+    collection = client.post("/api/v1/collections/", json={"name": "slash"}).json()
+    response = client.post(
+        f"/api/v1/collections/{collection['id']}/add/",
+        json={"ids": ["a"], "embeddings": [[1.0, 2.0]]},
+    )
+    assert response.status_code == 201
+
+    response = client.post(f"/api/v1/collections/{collection['id']}/get/", json={})
+    assert response.status_code == 200
+    assert response.json()["ids"] == ["a"]